@@ -73,7 +73,11 @@
 # - infix ops cannot be made of letters, digits, commas, dots: this would mess with the rest of the parsing.
 #   Special characters are recommended: @, !, \, $, #, ...
 #   Special characters can even be combined: '@*', '+!', ...
-# - the special character(s) for your custom infix need to be added to the 'white list' in <sanityCheck>
+# - custom infix ops are declared in 'Token._INFIX_NAMES', along with their priority 
+#   in 'Token._INFIX_PRIORITY' (same position in both tuples).
+#   'Token.INFIX_OPS' is a read-only view (a tuple) of this catalog.
+# - the 'white list' of chars in <sanityCheck> is derived from 'Token._INFIX_NAMES': 
+#   the special character(s) of your custom infix are accepted automatically
 # - the expected behaviour for this new infix operator needs to be defined.
 #
 # Infix operators that are not based on special characters will not be supported.
@@ -144,7 +148,11 @@
 # =============================================================================
 # External libs
 # =============================================================================
-# None.
+# Standard library only.
+import functools
+import string
+import sys
+import time
 
 
 
@@ -154,40 +162,84 @@
 # =============================================================================
 class Token :
 
+  # Fixed set of attributes: no per-instance __dict__.
+  # <_dispStr> is filled lazily for variables, numbers and spaces (see <dispStr>).
+  __slots__ = ("type", "name", "_dispStr")
+
+  # The catalog is stored as parallel tuples: the n-th entry of each tuple
+  # describes the n-th name. Scans and lookups only go through the names.
+
   # Warning: underscores in the constant's name is not allowed (rule [R5.10])
-  CONSTANTS = [
-    {"name": "pi" , "value": 3.14159265358979},
-    {"name": "i",   "value": 0.0},
-    {"name": "eps", "value": 0.0},
-    {"name": "inf", "value": 0.0}
-  ]
-  
-  FUNCTIONS = [
-    {"name": "id",    "nArgs": 1},
-    {"name": "sin",   "nArgs": 1},
-    {"name": "cos",   "nArgs": 1},
-    {"name": "tan",   "nArgs": 1},
-    {"name": "exp",   "nArgs": 1},
-    {"name": "ln",    "nArgs": 1},
-    {"name": "log10", "nArgs": 1},
-    {"name": "logN",  "nArgs": 2},
-    {"name": "abs",   "nArgs": 1},
-    {"name": "sqrt",  "nArgs": 1},
-    {"name": "floor", "nArgs": 1},
-    {"name": "ceil",  "nArgs": 1},
-    {"name": "round", "nArgs": 1},
-    {"name": "Q",     "nArgs": 2},
-    {"name": "sinc",  "nArgs": 1}
-  ]
+  _CONST_NAMES  = ("pi",             "i", "eps", "inf")
+  _CONST_VALUES = (3.14159265358979, 0.0, 0.0,   0.0)
+
+  _FUNC_NAMES = ("id", "sin", "cos", "tan", "exp", "ln", "log10", "logN", "abs", "sqrt", "floor", "ceil", "round", "Q", "sinc")
+  _FUNC_NARGS = (1,    1,     1,     1,     1,     1,    1,       2,      1,     1,      1,       1,      1,       2,   1)
+
+  _INFIX_NAMES    = ("+", "-", "*", "/", "//", "^")
+  _INFIX_PRIORITY = (1,   1,   2,   2,   2,    3)
+
+  # Same catalog, as records (read-only view, not used by the parser).
+  # Tuples: the catalog is extended through the tuples above, not here.
+  CONSTANTS = tuple({"name": n, "value": v}    for (n, v) in zip(_CONST_NAMES, _CONST_VALUES))
+  FUNCTIONS = tuple({"name": n, "nArgs": k}    for (n, k) in zip(_FUNC_NAMES, _FUNC_NARGS))
+  INFIX_OPS = tuple({"name": n, "priority": p} for (n, p) in zip(_INFIX_NAMES, _INFIX_PRIORITY))
+
+  # Name lookup tables, built once from the tuples above
+  _CONST_SET = frozenset(_CONST_NAMES)
+  _FUNC_SET  = frozenset(_FUNC_NAMES)
+
+  # Known names to (type, display string).
+  # Same precedence as in the constructor: constants, then functions, then infix.
+  _DISPATCH = {}
+  _DISPATCH.update({n: ("INFIX", f"OP:'{n}'") for n in _INFIX_NAMES})
+  _DISPATCH.update({n: ("FUNCTION", f"FCT:'{n}'") for n in _FUNC_NAMES})
+  _DISPATCH.update({n: ("CONSTANT", f"CONST:'{n}'") for n in _CONST_NAMES})
+  _DISPATCH.update({
+    "(": ("BRKT_OPEN",  "BRKT:'('"),
+    ")": ("BRKT_CLOSE", "BRKT:')'"),
+    ",": ("COMMA",      "SEP:','")
+  })
+
+  # Display prefix of the tokens whose name is not known in advance.
+  # Their display string is built on first use (see <dispStr>).
+  _DISP_PREFIX = {"VAR": "VAR", "NUMBER": "NUM", "SPACE": "BLK"}
+
+  # Names that cannot be used for a variable
+  _RESERVED_NAMES = _CONST_SET | _FUNC_SET
+
+  # Distinct name lengths, longest first. A scan tests the prefix of each 
+  # length against the name set: the first match is the longest one.
+  _CONST_LENS = tuple(sorted(set(map(len, _CONST_NAMES)), reverse = True))
+  _FUNC_LENS  = tuple(sorted(set(map(len, _FUNC_NAMES)),  reverse = True))
+
+  # Longest names first, so that the first match in a scan is the longest one
+  _INFIX_NAMES_BY_DECREASING_LEN = tuple(sorted(_INFIX_NAMES, key = len, reverse = True))
+
+  # Tokens of these types do not carry anything else than their name.
+  # They are created once and shared (see <__new__>).
+  _SHARED_TYPES = frozenset(["CONSTANT", "FUNCTION", "INFIX", "BRKT_OPEN", "BRKT_CLOSE", "COMMA"])
+  _CACHE = {}
+
+  # ---------------------------------------------------------------------------
+  # Allocator
+  # ---------------------------------------------------------------------------
+  def __new__(cls, name, value = 0) :
+    """
+    Description:
+    Returns the shared instance if the token has already been created, 
+    a new (uninitialised) object otherwise.
+
+    Tokens are never modified once created, so they can be shared safely.
+    Numbers and variables are not shared.
+    """
+    cached = Token._CACHE.get(name)
+    if (cached is not None) :
+      return cached
+    
+    return super().__new__(cls)
+
 
-  INFIX_OPS = [
-    {"name": "+",  "priority": 1},
-    {"name": "-",  "priority": 1},
-    {"name": "*",  "priority": 2},
-    {"name": "/",  "priority": 2},
-    {"name": "//", "priority": 2},
-    {"name": "^",  "priority": 3}
-  ]
 
   # ---------------------------------------------------------------------------
   # Default constructor
@@ -206,57 +258,74 @@ class Token :
     Examples:
     (See unit tests below)
     """
-    self.constantsList = [x["name"] for x in Token.CONSTANTS]
-    self.functionsList = [x["name"] for x in Token.FUNCTIONS]
-    self.infixOpsList  = [x["name"] for x in Token.INFIX_OPS]
-    
-    if (name in self.constantsList) :
-      self.type = "CONSTANT"
-      self.name = name
-      self.dispStr = f"CONST:'{name}'"
 
-    elif (name in self.functionsList) :
-      self.type = "FUNCTION"
-      self.name = name
-      self.dispStr = f"FCT:'{name}'"
+    # Shared token: already initialised
+    if hasattr(self, "type") :
+      return
+
+    known = Token._DISPATCH.get(name)
 
-    elif (name in self.infixOpsList) :
-      self.type = "INFIX"
+    if (known is not None) :
+      (self.type, self._dispStr) = known
       self.name = name
-      self.dispStr = f"OP:'{name}'"
 
     elif (checkVariableSyntax(name)) :
       self.type = "VAR"
       self.name = name
-      self.dispStr = f"VAR:'{name}'"
-
-    elif (name == "(") :
-      self.type = "BRKT_OPEN"
-      self.name = name
-      self.dispStr = f"BRKT:'('"
-
-    elif (name == ")") :
-      self.type = "BRKT_CLOSE"
-      self.name = name
-      self.dispStr = f"BRKT:')'"
-
-    elif (name == ",") :
-      self.type = "COMMA"
-      self.name = name
-      self.dispStr = f"SEP:','"
+      self._dispStr = None
 
     elif (isNumber(name)) :
       self.type = "NUMBER"
       self.name = name
-      self.dispStr = f"NUM:'{name}'"
+      self._dispStr = None
 
     elif (isBlank(name)) :
       self.type = "SPACE"
       self.name = name
-      self.dispStr = f"BLK:'{name}'"
+      self._dispStr = None
 
     else :
       print("[ERROR] Invalid token!")
+      return
+
+    if (self.type in Token._SHARED_TYPES) :
+      Token._CACHE[name] = self
+
+
+
+  # ---------------------------------------------------------------------------
+  # Constructor from a known type (internal)
+  # ---------------------------------------------------------------------------
+  @classmethod
+  def _fromKind(cls, kind, name) :
+    """
+    Description:
+    Constructs a token whose type <kind> is already known (e.g. found by 
+    <scanToken>): the classification chain of the default constructor is skipped.
+
+    No check is done: <name> must be a valid token of type <kind>.
+    """
+
+    # Shared tokens: found in the cache, or in <_DISPATCH> the first time.
+    if (kind in Token._SHARED_TYPES) :
+      return cls(name)
+
+    token = super().__new__(cls)
+    token.type = kind
+    token.name = name
+    token._dispStr = None
+    
+    return token
+
+
+  # Display string, e.g. "VAR:'x'"
+  @property
+  def dispStr(self) :
+    if (self._dispStr is None) :
+      self._dispStr = f"{Token._DISP_PREFIX[self.type]}:'{self.name}'"
+    
+    return self._dispStr
+
 
 
   # Define the behaviour of print(tokenObj)
@@ -270,6 +339,370 @@ class Token :
 
 
 
+# =============================================================================
+# Scanners
+# =============================================================================
+# Index based readers used by the tokenizer.
+# They read <inputStr> starting at position <pos>, and return the position
+# right after the match (or <pos> itself if nothing matched).
+# Diagnostics are appended to the list <messages> when one is given, 
+# printed otherwise.
+# The caller slices the token out of the input once it is known.
+# Only short slices are made while scanning, on purpose: the few leading chars
+# keying the caches of <scanConst>/<scanFunc>, and the name tested against
+# the reserved names in <scanVar>/<scanReserved>.
+
+# Char classes used by <scanVar>
+(_CC_OTHER, _CC_ALPHA, _CC_DIGIT, _CC_UNDERSCORE) = range(4)
+
+# Lookup table: char -> char class. Chars out of the table are in class "other".
+_CHAR_CLASS = {}
+_CHAR_CLASS.update(dict.fromkeys(string.ascii_letters, _CC_ALPHA))
+_CHAR_CLASS.update(dict.fromkeys(string.digits, _CC_DIGIT))
+_CHAR_CLASS["_"] = _CC_UNDERSCORE
+
+
+
+# Number of leading chars that decide the outcome of <scanConst> and <scanFunc>:
+# the longest name, plus the char coming right after it.
+_CONST_HEAD_LEN = Token._CONST_LENS[0] + 1
+_FUNC_HEAD_LEN  = Token._FUNC_LENS[0] + 1
+
+
+
+@functools.lru_cache(maxsize = 2048)
+def _scanConstHead(head) :
+  """
+  Description:
+  Returns the length of the constant leading <head>, 0 otherwise.
+  <head> is the beginning of the input, cropped to <_CONST_HEAD_LEN> chars.
+  
+  The outcome only depends on these few chars: it is cached, so that 
+  constants and names repeated across expressions are classified only once.
+  """
+
+  nChars = len(head)
+
+  # Constant names are tried from the longest to the shortest, 
+  # one set lookup per possible length.
+  for end in Token._CONST_LENS :
+    if ((end <= nChars) and (head[:end] in Token._CONST_SET)) :
+
+      # Case 1: the constant ends the string
+      if (end == nChars) :
+        return end
+      
+      # Case 2: there is a match, but something comes after
+      else :
+        nextChar = head[end]
+        
+        # See [R5.10]: underscore forbids to treat as a constant
+        if (nextChar == "_") :
+          return 0
+        
+        # The constant is embedded in a larger name (see [R5.12]).
+        # Can't conclude: try with the shorter names.
+        elif isAlpha(nextChar) :  
+          pass
+
+        else :
+          return end
+
+  # Case 3: never matched
+  return 0
+
+
+
+def scanConst(inputStr, pos, messages = None) :
+  """
+  Description:
+  Index based version of <consumeConst>.
+  Returns the end position of the constant starting at <pos>, <pos> otherwise.
+  """
+
+  return pos + _scanConstHead(inputStr[pos:pos + _CONST_HEAD_LEN])
+
+
+
+def scanNumber(inputStr, pos, messages = None) :
+  """
+  Description:
+  Index based version of <consumeNumber>.
+  Returns the end position of the number starting at <pos>, <pos> otherwise.
+  """
+
+  # Read the integer part, then an optional dot and the fractional part.
+  # The string is read only once: no intermediate heads are tested.
+  nChars = len(inputStr)
+  n = pos
+  while ((n < nChars) and ("0" <= inputStr[n] <= "9")) :
+    n += 1
+
+  if ((n < nChars) and (inputStr[n] == ".")) :
+    n += 1
+    while ((n < nChars) and ("0" <= inputStr[n] <= "9")) :
+      n += 1
+
+  # A single dot is not a number
+  if ((n == pos + 1) and (inputStr[pos] == ".")) :
+    return pos
+  
+  return n
+
+
+
+@functools.lru_cache(maxsize = 2048)
+def _scanFuncHead(head) :
+  """
+  Description:
+  Returns the length of the function name leading <head>, 0 otherwise.
+  <head> is the beginning of the input, cropped to <_FUNC_HEAD_LEN> chars.
+  The outcome is cached (see <_scanConstHead>).
+  """
+
+  # Function names are tried from the longest to the shortest:
+  # the first match is the longest one.
+  for end in Token._FUNC_LENS :
+    if (head.startswith("(", end) and (head[:end] in Token._FUNC_SET)) :
+      return end
+  
+  return 0
+
+
+
+def scanFunc(inputStr, pos, messages = None) :
+  """
+  Description:
+  Index based version of <consumeFunc>.
+  Returns the end position of the function name starting at <pos>, <pos> otherwise.
+  When there is a match, the opening parenthesis is found at the returned position.
+  """
+
+  return pos + _scanFuncHead(inputStr[pos:pos + _FUNC_HEAD_LEN])
+
+
+
+def _scanName(inputStr, pos) :
+  """
+  Description:
+  Reads the name starting at <pos>, following the variable naming rules.
+  The name may be a reserved one: this is left to the caller.
+
+  Returns the tuple (end, oddSyntax) where:
+  - <end> is the end position of the name, <pos> if there is no name
+  - <oddSyntax> is True if the name was cut before a fractional number (rule [R5.5]).
+  """
+
+  nChars = len(inputStr)
+
+  # Rule [R2]: a name must start with a letter or an underscore
+  if ((pos >= nChars) or not(_CHAR_CLASS.get(inputStr[pos]) in (_CC_ALPHA, _CC_UNDERSCORE))) :
+    return (pos, False)
+
+  n = pos + 1
+  while (n < nChars) :
+    c = _CHAR_CLASS.get(inputStr[n], _CC_OTHER)
+
+    # Coming next: letter or '_'
+    if ((c == _CC_ALPHA) or (c == _CC_UNDERSCORE)) :
+      n += 1
+
+    # Coming next: digit
+    elif (c == _CC_DIGIT) :
+      m = n + 1
+      while ((m < nChars) and (_CHAR_CLASS.get(inputStr[m]) == _CC_DIGIT)) :
+        m += 1
+
+      # Number with decimal point: apply rule [R5.5]
+      if ((m < nChars) and (inputStr[m] == ".")) :
+        return (n, True)
+
+      # Number without decimal point: apply rule [R5.3]
+      else :
+        n = m
+
+    # Coming next: anything else
+    else :
+      break
+
+  return (n, False)
+
+
+
+def scanVar(inputStr, pos, messages = None) :
+  """
+  Description:
+  Index based version of <consumeVar>.
+  Returns the end position of the variable starting at <pos>, <pos> otherwise.
+  """
+
+  (end, oddSyntax) = _scanName(inputStr, pos)
+
+  # Reserved names are not variables
+  if ((end == pos) or (inputStr[pos:end] in Token._RESERVED_NAMES)) :
+    return pos
+  
+  if oddSyntax :
+    report("[WARNING] Odd syntax: variable prefixed with a fractional number. Please double check the interpretation.", messages)
+
+  return end
+
+
+
+def scanReserved(inputStr, pos, messages = None) :
+  """
+  Description:
+  Returns the end position of the reserved name starting at <pos>, <pos> otherwise.
+
+  Called when the name could not be read as a constant nor as a function call: 
+  it is a function name missing its parenthesis (rule [R3]), e.g. "cos (3x)".
+  """
+
+  (end, _) = _scanName(inputStr, pos)
+
+  if ((end > pos) and (inputStr[pos:end] in Token._RESERVED_NAMES)) :
+    return end
+
+  return pos
+
+
+
+def scanInfix(inputStr, pos, messages = None) :
+  """
+  Description:
+  Index based version of <consumeInfix>.
+  Returns the end position of the infix operator starting at <pos>, <pos> otherwise.
+  """
+
+  # Infix names are tried from the longest to the shortest:
+  # the first match is the longest one (e.g. "//" is tested before "/").
+  for name in Token._INFIX_NAMES_BY_DECREASING_LEN :
+    if inputStr.startswith(name, pos) :
+      return pos + len(name)
+  
+  return pos
+
+
+
+
+
+# Scanners that can possibly match, given the leading char of the input, 
+# along with the kind of token they read.
+# They are listed in order of priority: the first match wins.
+_SCANNERS_BY_LEAD = {}
+_SCANNERS_BY_LEAD.update(dict.fromkeys(string.digits + ".", ((scanNumber, "NUMBER"),)))
+_SCANNERS_BY_LEAD.update(dict.fromkeys(string.ascii_letters + "_", ((scanConst, "CONSTANT"), (scanFunc, "FUNCTION"), (scanVar, "VAR"), (scanReserved, "RESERVED"))))
+_SCANNERS_BY_LEAD.update(dict.fromkeys([n[0] for n in Token._INFIX_NAMES], ((scanInfix, "INFIX"),)))
+
+# Single char tokens
+_SINGLE_CHAR_KINDS = {"(": "BRKT_OPEN", ")": "BRKT_CLOSE", ",": "COMMA"}
+
+
+
+def scanToken(inputStr, pos, messages = None) :
+  """
+  Description:
+  Read the next token in <inputStr>, starting at position <pos>.
+  Leading white spaces are skipped (rule [R9]).
+
+  Returns the tuple (kind, start, end) where:
+  - <kind> is the type of the token ("NUMBER", "VAR", "FUNCTION", ...)
+  - <start>, <end> delimit the token: inputStr[start:end]
+
+  For a function, the opening parenthesis is found at position <end>.
+
+  Special kinds:
+  - "END": nothing left to read
+  - "INVALID": the char at <start> cannot start any token
+  - "RESERVED": the reserved name inputStr[start:end] is misused (rule [R3]).
+
+  Diagnostics go to <messages> (see <report>).
+  """
+
+  nChars = len(inputStr)
+  while ((pos < nChars) and (inputStr[pos] == " ")) :
+    pos += 1
+
+  if (pos == nChars) :
+    return ("END", pos, pos)
+
+  # Only call the scanners that can match the leading char
+  char = inputStr[pos]
+  for (scan, kind) in _SCANNERS_BY_LEAD.get(char, ()) :
+    end = scan(inputStr, pos, messages)
+    if (end > pos) :
+      return (kind, pos, end)
+
+  return (_SINGLE_CHAR_KINDS.get(char, "INVALID"), pos, pos+1)
+
+
+
+
+
+@functools.lru_cache(maxsize = 1024)
+def tokenizeCached(inputStr) :
+  """
+  Description:
+  Core of <QParser.tokenize>, memoized on the input string.
+
+  Returns the tuple (tokens, variables, messages) where:
+  - <tokens> is the tuple of Token objects read from <inputStr>
+  - <variables> is the tuple of variable names, in order of appearance
+  - <messages> is the tuple of warnings and errors issued while reading.
+
+  Tokens are never modified once created, so the same objects are 
+  safely returned for repeated calls with the same input.
+  Nothing is printed here: the diagnostics are part of the cached value, 
+  so that every caller can report them (see <QParser.tokenize>).
+  """
+
+  # Each token takes at least one char (a function and its parenthesis take
+  # at least 2 chars for 2 tokens): the token list is allocated once.
+  tokenList = [None] * len(inputStr)
+  nTokens = 0
+
+  # The input is read with a cursor <pos>: substrings are only 
+  # created for the tokens themselves.
+  pos = 0
+
+  # Diagnostics are collected, not printed: they are part of the cached value.
+  messages = []
+  while True :
+    (kind, start, end) = scanToken(inputStr, pos, messages)
+
+    if (kind == "END") :
+      break
+
+    elif (kind == "FUNCTION") :
+      tokenList[nTokens]   = Token._fromKind(kind, inputStr[start:end])
+      tokenList[nTokens+1] = Token("(")
+      nTokens += 2
+      end += 1
+
+    # Chars that cannot start a token are reported and skipped
+    elif (kind == "INVALID") :
+      messages.append(markInStr(inputStr, start))
+      messages.append("[ERROR] unexpected character.")
+
+    # Reserved names are reported and skipped as a whole
+    elif (kind == "RESERVED") :
+      messages.append(markInStr(inputStr, start))
+      messages.append(f"[ERROR] '{inputStr[start:end]}' is a function: it must be immediately followed by a parenthesis (rule [R3]).")
+
+    else :
+      tokenList[nTokens] = Token._fromKind(kind, inputStr[start:end])
+      nTokens += 1
+
+    pos = end
+
+  tokens = tuple(tokenList[:nTokens])
+  variables = tuple(dict.fromkeys(t.name for t in tokens if (t.type == "VAR")))
+  return (tokens, variables, tuple(messages))
+
+
+
+
+
 # =============================================================================
 # QParser class
 # =============================================================================
@@ -277,12 +710,54 @@ class Token :
 # - <input>     : string containing the expression to be parsed
 # - <variables> : list of variables identified while parsing
 class QParser :
+
+  # Characters accepted by <sanityCheck>
+  _VALID_CHARS = string.ascii_letters + string.digits + " .,_()" + "".join(Token._INFIX_NAMES)
+
+  _VALID_SET = frozenset(_VALID_CHARS)
+
+  # Translation table deleting all the valid chars
+  _VALID_DELETE = str.maketrans("", "", _VALID_CHARS)
+
+  # Pairs of consecutive chars rejected by <firstOrderCheck>
+  # 
+  # TODO: this list needs to be completed.
+  # 
+  _FORBIDDEN_PAIRS = (
+    ("..", "cannot make sense of 2 consecutive dots. Is it a typo?"),
+    (",,", "cannot make sense of 2 consecutive commas. Is it a typo?"),
+    (",)", "possible missing argument?")
+  )
+
+  # Pairs of consecutive token types that hide a multiplication
+  _IMPLICIT_MULT_PAIRS = frozenset([
+    ("CONSTANT",   "BRKT_OPEN"),  # Example: "pi(x+4)"
+    ("VAR",        "BRKT_OPEN"),  # Example: "R1(R2+R3)"
+    ("VAR",        "NUMBER"),     # Example: "x_2.1"
+    ("BRKT_CLOSE", "CONSTANT"),   # Example: "(x+1)pi"
+    ("BRKT_CLOSE", "FUNCTION"),   # Example: "(x+1)cos(y)"
+    ("BRKT_CLOSE", "VAR"),        # Example: "(R2+R3)R1"
+    ("BRKT_CLOSE", "BRKT_OPEN"),  # Example: "(x+y)(x-y)"
+    ("BRKT_CLOSE", "NUMBER"),     # Example: "(x+y)100"
+    ("NUMBER",     "CONSTANT"),   # Example: "2pi"
+    ("NUMBER",     "FUNCTION"),   # Example: "2exp(-3t)"
+    ("NUMBER",     "VAR"),        # Example: "2x"
+    ("NUMBER",     "BRKT_OPEN")   # Example: "2(x+y)"
+  ])
+
+  # Multiplication token inserted by <expandMult>
+  _MULT_TOKEN = Token("*")
   
   # Default constructor
   def __init__(self, input = "") :
     self.input     = input
     self.variables = []
 
+    # Same content as <variables>, for constant time membership tests.
+    # <_variablesList> is the list object the set was built from.
+    self._variablesSet  = set()
+    self._variablesList = self.variables
+
 
 
   # -----------------------------------------------------------------------------
@@ -309,22 +784,16 @@ class QParser :
     (See unit tests below)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
-    infixOpsExt = []
-    for t in Token.INFIX_OPS :
-      infixOpsExt += list(t["name"])
+    # Fast path: once the valid chars are deleted, nothing should remain.
+    # The whole string is processed by a single builtin call.
+    if (inputStr.translate(QParser._VALID_DELETE) == "") :
+      return True
 
+    # Otherwise, locate the first invalid character
     for (loc, char) in enumerate(inputStr) :
-      alphaTest   = ((ord(char) >= ord("a")) and (ord(char) <= ord("z"))) or ((ord(char) >= ord("A")) and (ord(char) <= ord("Z")))
-      digitTest   =  (ord(char) >= ord("0")) and (ord(char) <= ord("9"))      
-      infixTest   = (char in infixOpsExt)
-      othersTest  = (char in [" ", ".", ",", "_", "(", ")"])
-      
-      if not(alphaTest or digitTest or infixTest or othersTest) :
+      if not(char in QParser._VALID_SET) :
         showInStr(inputStr, loc)
         print("[ERROR] this character is not supported by the parser.")
         return False
@@ -348,23 +817,25 @@ class QParser :
     (See unit tests)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
+    # Jump from one closing parenthesis to the next one, and count the 
+    # opening parenthesis in between. This way the string is scanned by the 
+    # builtin <find> and <count> instead of a char by char loop.
     level = 0
-    for (loc, char) in enumerate(inputStr) :
-      if (char == "(") :
-        level += 1
-      elif (char == ")") :
-        level -= 1
+    start = 0
+    loc = inputStr.find(")")
+    while (loc != -1) :
+      level += inputStr.count("(", start, loc) - 1
 
       if (level < 0) :
         showInStr(inputStr, loc)
         print("[ERROR] closing parenthesis in excess.")
         return False
 
+      start = loc + 1
+      loc = inputStr.find(")", start)
+
     return True
 
 
@@ -379,38 +850,21 @@ class QParser :
     Detailed list can be found in 'firstOrderCheck.xslx'.
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
 
-    for i in (range(len(inputStr)-1)) :
-      
-      charA = inputStr[i]; charB = inputStr[i+1]
+    # Look for each forbidden pair with the builtin <find>, and report
+    # the one that comes first in the string.
+    locMin = -1
+    for (pair, message) in QParser._FORBIDDEN_PAIRS :
+      loc = inputStr.find(pair)
+      if ((loc != -1) and ((locMin == -1) or (loc < locMin))) :
+        (locMin, errorMessage) = (loc, message)
 
-      match (charA, charB) :
-        case (".", ".") :
-          showInStr(inputStr, i+1)
-          print("[ERROR] cannot make sense of 2 consecutive dots. Is it a typo?")
-          return False
-        
-        case (",", ",") :
-          showInStr(inputStr, i+1)
-          print("[ERROR] cannot make sense of 2 consecutive commas. Is it a typo?")
-          return False
-
-        case (",", ")") :
-          showInStr(inputStr, i+1)
-          print("[ERROR] possible missing argument?")
-          return False
-
-        # 
-        # TODO: this section needs to be completed.
-        # 
-
-        case _:
-          pass
+    if (locMin != -1) :
+      showInStr(inputStr, locMin+1)
+      print(f"[ERROR] {errorMessage}")
+      return False
 
     return True
 
@@ -425,10 +879,7 @@ class QParser :
     Check if reserved words (like function names, constants) are used incorrectly.
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
     print("TODO")
 
@@ -448,19 +899,16 @@ class QParser :
     (See unit tests)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
     # Input guard
-    assert isinstance(inputStr, str), "<consumeConst> expects a string as an input."
+    assert isinstance(inputStr, str), "<consumeSpace> expects a string as an input."
+
+    tail = inputStr.lstrip(" ")
+    return (inputStr[:len(inputStr)-len(tail)], tail)
+
+
 
-    for n in range(len(inputStr)) :
-      if (inputStr[n] != " ") :
-        return split(inputStr, n)
-        
-    
 
   # -----------------------------------------------------------------------------
   # METHOD: consumeConst(<string>)
@@ -481,49 +929,19 @@ class QParser :
     in a larger name, the tuple ("", input) is returned.
     Refer to rules [5.X] for more details about the parsing strategy.
  
-    The list of available constants is fetched from 'Token.CONSTANTS'.
+    The list of available constants is fetched from 'Token._CONST_NAMES'.
 
     Examples:
     (See unit tests)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
     # Input guard
     assert isinstance(inputStr, str), "<consumeConst> expects a string as an input."
 
-    constList = [c["name"] for c in Token.CONSTANTS]
-
-    for n in range(1, len(inputStr)+1) :
-      (head, tail) = split(inputStr, n)
-      if (head in constList) :
-        
-        # Case 1: the whole string matches with a known constant
-        if (n == len(inputStr)) :
-          return (head, "")
-        
-        # Case 2: there is a match, but something comes after
-        else :
-          nextChar = tail[0]
-          
-          # See [R5.10]: underscore forbids to treat as a constant
-          if (nextChar == "_") :
-            return ("", inputStr)
-          
-          # From that point: the only way to match is to have a bigger
-          # constant name, whose beginning matched with a known constant (see [R5.12])
-          # Can't conclude.
-          elif isAlpha(nextChar) :  
-            pass
-
-          else :
-            return (head, tail)
-
-    # Case 3: never matched
-    return ("", inputStr)
+    end = scanConst(inputStr, 0)
+    return (inputStr[:end], inputStr[end:])
 
 
 
@@ -566,28 +984,10 @@ class QParser :
     (See unit tests for more examples)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
-
-    # Test the first character.
-    # A valid number can only start with a digit or a "."
-    if not(inputStr[0].isdigit() or (inputStr[0] == ".")) :
-      return ("", inputStr)
+    inputStr = input or self.input
 
-    # Start from the first character and consume the remaining chars as long as it makes sense as a number.
-    # The longest string that passed the <isNumber> test becomes the candidate.
-    nMax = 0
-    for n in range(1, len(inputStr)+1) :
-      (head, _) = split(inputStr, n)
-      if isNumber(head) :
-        nMax = n
-
-      else:
-        break
-    
-    return split(inputStr, nMax)
+    end = scanNumber(inputStr, 0)
+    return (inputStr[:end], inputStr[end:])
 
 
 
@@ -609,7 +1009,7 @@ class QParser :
     If <input> does not start with a known function, the tuple ("", input) is 
     returned.
  
-    The list of available functions is fetched from 'Token.FUNCTIONS'.
+    The list of available functions is fetched from 'Token._FUNC_NAMES'.
 
     Notes:
     - The function name must be immediatly followed by an opening parenthesis "(".
@@ -630,22 +1030,14 @@ class QParser :
     (See unit tests for more examples)
     """
     
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
-
-    functionsExt = [(f["name"] + "(") for f in Token.FUNCTIONS]
+    inputStr = input or self.input
 
-    nMax = 0
-    for n in range(1, len(inputStr)+1) :
-      (head, _) = split(inputStr, n)
-      if (head in functionsExt) :
-        nMax = n
-    
     # Return the function without opening bracket 
-    (tmpHead, tmpTail) = split(inputStr, nMax)
-    return (tmpHead[0:-1], tmpTail)
+    end = scanFunc(inputStr, 0)
+    if (end > 0) :
+      return (inputStr[:end], inputStr[end+1:])
+    else :
+      return ("", inputStr)
 
 
 
@@ -683,66 +1075,13 @@ class QParser :
     (See unit tests)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
     # Input guard
     assert isinstance(inputStr, str), "<consumeVar> expects a string as an input."
 
-    OUTPUT_FAILURE = ("", inputStr)
-    reservedNames = [x["name"] for x in Token.CONSTANTS] + [x["name"] for x in Token.FUNCTIONS]
-
-    # Rule [R2]: a variable must start with a letter or an underscore
-    if not(isAlpha(inputStr[0]) or (inputStr[0] == "_")) :
-      return ("", inputStr)
-
-    output = (-1, "")
-    for n in range(1, len(inputStr)+1) :
-      (head, tail) = split(inputStr, n)
-      
-      # End of string reached
-      if (n == len(inputStr)) :
-        output = (head, "")
-        break
-      
-      # There are remaining characters to process
-      else :
-        nextChar = tail[0]
-
-        # Coming next: letter or '_'
-        if (isAlpha(nextChar) or (nextChar == "_")) :
-          pass
-
-        # Coming next: digit
-        elif isDigit(nextChar) :
-          (nbr, _) = self.consumeNumber(tail)
-        
-          # Number with decimal point: apply rule [R5.5]
-          if ("." in nbr) :
-            print("[WARNING] Odd syntax: variable prefixed with a fractional number. Please double check the interpretation.")
-            output = (head, tail)
-            break
-            
-          # Number without decimal point: apply rule [R5.3]
-          else :
-            pass
-
-        # Coming next: anything else
-        else :
-          output = (head, tail)
-          break
-
-    (var, _) = output
-    if not(var in reservedNames) :
-      return output
-    
-    elif (var == -1) :
-      print("[ERROR] Internal error.")
-
-    else :
-      return OUTPUT_FAILURE
+    end = scanVar(inputStr, 0)
+    return (inputStr[:end], inputStr[end:])
 
 
 
@@ -752,16 +1091,29 @@ class QParser :
   def addVariable(self, input = "") :
     """
     Description:
-    TODO
+    Add the variable <input> to the list of variables (<variables> attribute) 
+    if it is not already in it. 
+    
+    The membership test is a hash lookup in a set mirroring <variables>.
+    <variables> is public and stays the reference: the set is rebuilt 
+    whenever the list was replaced or their sizes differ (e.g. after the 
+    list was cleared).
+    Names are interned so that equal names share the same string.
 
     Examples:
     (See unit tests)
     """
     
     if (len(input) > 0) :
-      if not(input in self.variables) :
-        print(f"[NOTE] New variable added: '{input}'")
-        self.variables.append(input)
+      name = sys.intern(input)
+      if ((self._variablesList is not self.variables) or (len(self._variablesSet) != len(self.variables))) :
+        self._variablesSet  = set(self.variables)
+        self._variablesList = self.variables
+
+      if not(name in self._variablesSet) :
+        print(f"[NOTE] New variable added: '{name}'")
+        self._variablesSet.add(name)
+        self.variables.append(name)
 
 
 
@@ -783,7 +1135,7 @@ class QParser :
 
     If <input> does not start with a known infix operator, the tuple ("", input) is returned.
  
-    The list of available infix operators is fetched from Token.INFIX_OPS.
+    The list of available infix operators is fetched from 'Token._INFIX_NAMES'.
 
     The list of infix operators can be extended with custom operators.
     Please refer to [R6] to see the rules that apply for that.
@@ -792,25 +1144,13 @@ class QParser :
     (See unit tests)
     """
 
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
+    inputStr = input or self.input
 
     # Input guard
     assert isinstance(inputStr, str), "<consumeInfix> expects a string as an input."
 
-    infixOpsList = [op["name"] for op in Token.INFIX_OPS]
-
-    nMax = 0
-    for n in range(1, len(inputStr)+1) :
-      (head, _) = split(inputStr, n)
-      
-      # Returns True only if the whole word matches
-      if (head in infixOpsList) :
-        nMax = n
-    
-    return split(inputStr, nMax)
+    end = scanInfix(inputStr, 0)
+    return (inputStr[:end], inputStr[end:])
 
 
 
@@ -825,68 +1165,24 @@ class QParser :
     The input characters are read, grouped and classified as abstracted types
     (Token objects) while preserving their information.
 
-    
-    """
-
-    if (len(input) > 0) :
-      inputStr = input
-    else :
-      inputStr = self.input
-
-    tokenList = []
-
-    while(len(inputStr) > 0) :
-
-      # White spaces do not contribute to the parsing (rule [R9])
-      (_, inputStr) = self.consumeSpace(inputStr)
-      if (len(inputStr) == 0) :
-        break
-
-      (number, tailNumber)      = self.consumeNumber(inputStr)
-      (constant, tailConstant)  = self.consumeConst(inputStr)
-      (function, tailFunction)  = self.consumeFunc(inputStr)
-      (variable, tailVariable)  = self.consumeVar(inputStr)
-      (infix, tailInfix)        = self.consumeInfix(inputStr)
-
-      if (number != "") :
-        tokenList.append(Token(number))
-        inputStr = tailNumber
-
-      elif (constant != "") :
-        tokenList.append(Token(constant))
-        inputStr = tailConstant
-      
-      elif (function != "") :
-        tokenList.append(Token(function))
-        tokenList.append(Token("("))
-        inputStr = tailFunction
-
-      elif (variable != "") :
-        tokenList.append(Token(variable))
-        inputStr = tailVariable
-        
-      elif (infix != "") :
-        tokenList.append(Token(infix))
-        inputStr = tailInfix
-
-      else :
-        (head, tail) = pop(inputStr)
+    The variables found in the expression are added to <variables>.
 
-        if (head == "(") :
-          tokenList.append(Token(head))
-          inputStr = tail
+    The tokenization itself is memoized (see <tokenizeCached>): parsing the 
+    same expression again is only a cache lookup. The warnings and errors 
+    are printed again on each call.
+    """
 
-        elif (head == ")") :
-          tokenList.append(Token(head))
-          inputStr = tail
+    inputStr = input or self.input
 
-        elif (head == ",") :
-          tokenList.append(Token(head))
-          inputStr = tail
+    (tokens, variables, messages) = tokenizeCached(inputStr)
 
+    for m in messages :
+      print(m)
 
+    for v in variables :
+      self.addVariable(v)
 
-    return tokenList
+    return list(tokens)
 
 
   # ---------------------------------------------------------------------------
@@ -907,67 +1203,22 @@ class QParser :
       return input
 
     else :
-      output = []
-      for n in range(nTokens-1) :
-        tokA = input[n]; tokB = input[n+1]
-
-        output.append(tokA)
-
-        match (tokA.type, tokB.type) :
-          
-          # Example: "pi(x+4)"
-          case ("CONSTANT", "BRKT_OPEN") :
-            output.append(Token("*"))
-
-          # Example: "R1(R2+R3)"
-          case ("VAR", "BRKT_OPEN") :
-            output.append(Token("*"))
-
-          # Example: "x_2.1"
-          case ("VAR", "NUMBER") :
-            output.append(Token("*"))
-
-          # Example: "(x+1)pi"
-          case ("BRKT_CLOSE", "CONST") :
-            output.append(Token("*"))
-
-          # Example: "(x+1)cos(y)"
-          case ("BRKT_CLOSE", "FUNCTION") :
-            output.append(Token("*"))
-
-          # Example: "(R2+R3)R1"
-          case ("BRKT_CLOSE", "VAR") :
-            output.append(Token("*"))
+      # First pass: locate the implicit multiplications, so that the size of
+      # the output is known.
+      isMult = [((input[n].type, input[n+1].type) in QParser._IMPLICIT_MULT_PAIRS) for n in range(nTokens-1)]
 
-          # Example: "(x+y)(x-y)"
-          case ("BRKT_CLOSE", "BRKT_OPEN") :
-            output.append(Token("*"))
-
-          # Example: "(x+y)100"
-          case ("BRKT_CLOSE", "NUMBER") :
-            output.append(Token("*"))
-
-          # Example: "2pi"
-          case ("NUMBER", "CONST") :
-            output.append(Token("*"))
-
-          # Example: "2exp(-3t)"
-          case ("NUMBER", "FUNCTION") :
-            output.append(Token("*"))
-
-          # Example: "2x"
-          case ("NUMBER", "VAR") :
-            output.append(Token("*"))
-
-          # Example: "2(x+y)"
-          case ("NUMBER", "BRKT_OPEN") :
-            output.append(Token("*"))
+      # Second pass: fill the output
+      output = [None] * (nTokens + sum(isMult))
+      m = 0
+      for n in range(nTokens-1) :
+        output[m] = input[n]
+        m += 1
 
-          case (_, _) :
-            pass
+        if isMult[n] :
+          output[m] = QParser._MULT_TOKEN
+          m += 1
       
-      if (n == (nTokens-2)) :
-        output.append(tokB)
+      output[m] = input[nTokens-1]
 
     return output
   
@@ -977,6 +1228,14 @@ class QParser :
 # Utilities
 # =============================================================================
 
+# Translation table deleting all the chars allowed in a variable name
+_VAR_DELETE = str.maketrans("", "", string.ascii_letters + string.digits + "_")
+
+# Shared result for the trivial splits of an empty string (tuples are immutable)
+_EMPTY_PAIR = ("", "")
+
+
+
 def pop(inputStr) :
   """
   Description:
@@ -991,12 +1250,11 @@ def pop(inputStr) :
   - pop("") = ("", "")
   """
 
-  if not inputStr :
-    return ("", "")
-  elif (len(inputStr) == 1) :
-    return (inputStr, "")
-  else :
-    return (inputStr[0], inputStr[1:])
+  if (inputStr == "") :
+    return _EMPTY_PAIR
+
+  # Slicing is safe out of range: no special case needed
+  return (inputStr[:1], inputStr[1:])
 
 
 
@@ -1022,14 +1280,15 @@ def split(inputStr, n) :
   assert isinstance(inputStr, str), "<split> first argument must be a string."
   assert isinstance(n, int), "<split> second argument must be an integer."
   
-  if not(inputStr) :
-    return ("", "")
-  elif (n > len(inputStr)) :
-    return (inputStr, "")
-  elif (n <= 0) :
-    return ("", inputStr)
-  else :
-    return(inputStr[0:n], inputStr[n:])
+  # Slicing is safe for <n> greater than the length. 
+  # Negative values need to be clamped (they count from the end otherwise).
+  if (n < 0) :
+    n = 0
+
+  if (inputStr == "") :
+    return _EMPTY_PAIR
+
+  return (inputStr[:n], inputStr[n:])
 
 
 
@@ -1039,13 +1298,10 @@ def isAlpha(inputStr) :
   Returns True if the first char of inputStr is a letter.
   Capitalisation is ignored.
   """
-  char = inputStr[0]
-
-  testAlpha = False
-  testAlpha = testAlpha or ((ord(char) >= ord("A")) and (ord(char) <= ord("Z")))
-  testAlpha = testAlpha or ((ord(char) >= ord("a")) and (ord(char) <= ord("z")))
+  # Setting bit 5 maps 'A'..'Z' onto 'a'..'z': a single range test is left.
+  code = ord(inputStr[0]) | 0x20
 
-  return testAlpha
+  return (0x61 <= code <= 0x7A)
 
 
 
@@ -1054,9 +1310,7 @@ def isDigit(inputStr) :
   Description:
   Returns True if the first char of inputStr is a digit.
   """
-  char = inputStr[0]
-
-  return (ord(char) >= ord("0")) and (ord(char) <= ord("9"))
+  return ("0" <= inputStr[0] <= "9")
 
 
 
@@ -1064,8 +1318,11 @@ def isBlank(inputStr) :
   """
   Description:
   Returns True if the input string only contains whitespaces.
+  The empty string is not considered as blank.
   """
-  print("TODO")
+  
+  # Same definition of a whitespace as in <consumeSpace>
+  return ((inputStr != "") and (inputStr.strip(" ") == ""))
 
 
 
@@ -1087,26 +1344,17 @@ def isNumber(inputStr) :
   # Input guard
   assert isinstance(inputStr, str), "<isNumber> expects a string as an input."
 
-  gotDigit = False
+  # Fast path: whole numbers pass without any copy of the string.
+  # <isdigit> also accepts non-ASCII digits (e.g. "²"), hence the <isascii> test.
+  if (inputStr.isdigit() and inputStr.isascii()) :
+    return True
 
-  # Detect invalid inputs
-  if (inputStr in ["", "."]) :
-    return False
+  # Remove the decimal point (if any): what is left must be a non empty 
+  # string of ASCII digits. Empty strings, single dots, more than one dot 
+  # and any other char are rejected by the same test.
+  digits = inputStr.replace(".", "", 1)
 
-  for char in inputStr :
-    if (char == ".") :
-      if gotDigit :
-        return False
-      
-      else :
-        gotDigit = True
-    
-    # Anything else than a dot or a digit is invalid
-    elif not(isDigit(char)) :
-      return False
-  
-  # If we made it up to here, it's a valid number.
-  return True
+  return (digits.isascii() and digits.isdigit())
 
 
 
@@ -1123,23 +1371,20 @@ def checkVariableSyntax(inputStr) :
   """
   
   # Input guard
-  assert isinstance(inputStr, str), "<isNumber> expects a string as an input."
+  assert isinstance(inputStr, str), "<checkVariableSyntax> expects a string as an input."
 
-  # Filter out reserved names
-  if (inputStr in ([x["name"] for x in Token.CONSTANTS] + [x["name"] for x in Token.FUNCTIONS])) :
+  # Filter out reserved names and the empty string
+  if ((inputStr == "") or (inputStr in Token._RESERVED_NAMES)) :
     return False
 
   # First character must start with a letter or an underscore (rule [R2])
   if not(isAlpha(inputStr[0]) or inputStr[0] == "_") :
     return False
 
-  # Look for forbidden characters:
-  for char in inputStr :
-    testAlpha = isAlpha(char)
-    testDigit = isDigit(char)
-    testUnder = (char == "_")
-    if not(testAlpha or testDigit or testUnder) :
-      return False
+  # Look for forbidden characters: once the allowed ones are deleted, 
+  # nothing should remain.
+  if (inputStr.translate(_VAR_DELETE) != "") :
+    return False
 
   return True
 
@@ -1155,11 +1400,34 @@ def showInStr(inputStr, loc) :
   <loc> shall point using a 0-indexing convention.
   """
   
-  print(inputStr)  
+  print(markInStr(inputStr, loc))
+
+
+
+def markInStr(inputStr, loc) :
+  """
+  Description:
+  Returns the text printed by <showInStr>.
+  """
+  
   if ((loc >= 0) and (loc < len(inputStr))) :
-    s = [" "] * len(inputStr)
-    s[loc] = "^"
-    print("".join(s))
+    return inputStr + "\n" + " "*loc + "^"
+  
+  return inputStr
+
+
+
+def report(message, messages = None) :
+  """
+  Description:
+  Appends <message> to the list <messages> if given, prints it otherwise.
+  It lets the callers choose when the diagnostics are shown (see <tokenizeCached>).
+  """
+  
+  if (messages is None) :
+    print(message)
+  else :
+    messages.append(message)
 
 
 
@@ -1168,129 +1436,269 @@ def showInStr(inputStr, loc) :
 # -----------------------------------------------------------------------------
 if (__name__ == '__main__') :
   
+  # Only used by the unit tests (output capture)
+  import contextlib
+  import io
+
   print("[INFO] Standalone call: running unit tests...")
 
+  assert(Token("*") is Token("*"))
+  assert(isinstance(Token.INFIX_OPS, tuple) and (Token.INFIX_OPS[-1] == {"name": "^", "priority": 3}))
+  assert(not(hasattr(Token("x"), "__dict__")))
+  assert(Token("(") is Token("("))
+  assert(Token("pi") is Token("pi"))
+  assert(Token("x") is not Token("x"))
+  assert(Token("1.5") is not Token("1.5"))
+  assert(Token._fromKind("VAR", "x").dispStr == Token("x").dispStr)
+  assert(Token._fromKind("NUMBER", "1.5").dispStr == Token("1.5").dispStr)
+  assert(Token._fromKind("FUNCTION", "sin") is Token("sin"))
+  with contextlib.redirect_stdout(io.StringIO()) as log :
+    assert(not(hasattr(Token(""), "type")))
+  assert(log.getvalue() == "[ERROR] Invalid token!\n")
+  print("- Passed: <Token>")
+
   qParser = QParser()
 
-  assert(isNumber("") == False)
-  assert(isNumber("1") == True)
-  assert(isNumber("23") == True)
-  assert(isNumber("4.5") == True)
-  assert(isNumber("6.0") == True)
-  assert(isNumber("789.000000000") == True)
-  assert(isNumber(".123456") == True)
-  assert(isNumber(".1") == True)
-  assert(isNumber("4.2.") == False)
-  assert(isNumber(" 12") == False)
-  assert(isNumber("2 ") == False)
-  assert(isNumber("120 302") == False)
-  assert(isNumber(".0") == True)
-  assert(isNumber(".") == False)
-  assert(isNumber("-") == False)
-  assert(isNumber("-1") == False)
-  assert(isNumber("-0") == False)
-  assert(isNumber("-.") == False)
-  assert(isNumber("-.0") == False)
-
-  assert(checkVariableSyntax("x") == True)
-  assert(checkVariableSyntax("xyz") == True)
-  assert(checkVariableSyntax("1.2") == False)
-  assert(checkVariableSyntax("314") == False)
-  assert(checkVariableSyntax("314_x") == False)
-  assert(checkVariableSyntax("a_b_c_d_") == True)
-  assert(checkVariableSyntax("exp") == False)
-  assert(checkVariableSyntax("_u") == True)
-  assert(checkVariableSyntax("_sin") == True)
-
-  assert(qParser.sanityCheck("pro_ut*cos(2x+pi") == True)
-  assert(qParser.sanityCheck("input Str") == True)
-  assert(qParser.sanityCheck("input Str2.1(a+b)|x|") == False)
-  assert(qParser.sanityCheck("$inputStr") == False)
-  assert(qParser.sanityCheck("µinputStr") == False)
-  assert(qParser.sanityCheck("in#putStr") == False)
-  assert(qParser.sanityCheck("inputStr%") == False)
-  assert(qParser.sanityCheck("inpuétStr") == False)
-  assert(qParser.sanityCheck("inpuàtStr") == False)
+  assert(pop("abcde") == ("a", "bcde"))
+  assert(pop("a") == ("a", ""))
+  assert(pop("") == ("", ""))
+
+  assert(split("pouet",-1) == ("", "pouet"))
+  assert(split("pouet",0) == ("", "pouet"))
+  assert(split("pouet",1) == ("p", "ouet"))
+  assert(split("pouet",2) == ("po", "uet"))
+  assert(split("pouet",5) == ("pouet", ""))
+  assert(split("pouet",6) == ("pouet", ""))
+  assert(split("pouet",100) == ("pouet", ""))
+  assert(split("",2) == ("", ""))
+
+  for (inputStr, expected) in [
+    ("",               False),
+    ("1",              True),
+    ("23",             True),
+    ("4.5",            True),
+    ("6.0",            True),
+    ("789.000000000",  True),
+    (".123456",        True),
+    (".1",             True),
+    ("4.2.",           False),
+    (" 12",            False),
+    ("2 ",             False),
+    ("120 302",        False),
+    (".0",             True),
+    (".",              False),
+    ("-",              False),
+    ("-1",             False),
+    ("-0",             False),
+    ("-.",             False),
+    ("-.0",            False),
+    ("1é",             False),
+  ] :
+    assert(isNumber(inputStr) == expected), inputStr
+
+  for (inputStr, expected) in [
+    ("",          False),
+    ("x",         True),
+    ("xyz",       True),
+    ("1.2",       False),
+    ("314",       False),
+    ("314_x",     False),
+    ("a_b_c_d_",  True),
+    ("exp",       False),
+    ("_u",        True),
+    ("_sin",      True),
+    ("xé",        False),
+    ("x-y",       False),
+  ] :
+    assert(checkVariableSyntax(inputStr) == expected), inputStr
+
+  for (inputStr, expected) in [
+    (" ",     True),
+    ("    ",  True),
+    ("",      False),
+    (" x ",   False),
+    ("x",     False),
+  ] :
+    assert(isBlank(inputStr) == expected), inputStr
+
+  assert(isAlpha("a") and isAlpha("Z") and not(isAlpha("_")) and not(isAlpha("é")) and not(isAlpha("1")))
+  assert(isDigit("0") and isDigit("9") and not(isDigit("a")) and not(isDigit("²")))
+
+  for (inputStr, expected) in [
+    ("pro_ut*cos(2x+pi",      True),
+    ("input Str",             True),
+    ("input Str2.1(a+b)|x|",  False),
+    ("$inputStr",             False),
+    ("µinputStr",             False),
+    ("in#putStr",             False),
+    ("inputStr%",             False),
+    ("inpuétStr",             False),
+    ("inpuàtStr",             False),
+    ("inpu?tStr",             False),
+  ] :
+    assert(qParser.sanityCheck(inputStr) == expected), inputStr
   print("- Passed: <sanityCheck>")
 
-  assert(qParser.bracketBalanceCheck("pro_ut*cos(2x+pi") == True)
-  assert(qParser.bracketBalanceCheck("pro_ut*cos(2x+pi(") == True)
-  assert(qParser.bracketBalanceCheck("pro_ut*cos(2x+pi()))") == False)
-  assert(qParser.bracketBalanceCheck("|3x+6|.2x") == True)
+  for (inputStr, expected) in [
+    ("pro_ut*cos(2x+pi",      True),
+    ("pro_ut*cos(2x+pi(",     True),
+    ("pro_ut*cos(2x+pi()))",  False),
+    ("|3x+6|.2x",             True),
+    (")(",                    False),
+    ("(a)(b))(c",             False),
+  ] :
+    assert(qParser.bracketBalanceCheck(inputStr) == expected), inputStr
   print("- Passed: <bracketBalanceCheck>")
 
-  assert(qParser.firstOrderCheck("sin(2..1x)") == False)
-  assert(qParser.firstOrderCheck("1+Q(2,)") == False)
-  assert(qParser.firstOrderCheck("cos(3x+1)*Q(2,,1)") == False)
+  for (inputStr, expected) in [
+    ("sin(2..1x)",         False),
+    ("1+Q(2,)",            False),
+    ("cos(3x+1)*Q(2,,1)",  False),
+    ("Q(2,)+1..2",         False),
+    ("Q(2,1)+1.2",         True),
+  ] :
+    assert(qParser.firstOrderCheck(inputStr) == expected), inputStr
   print("- Passed: <firstOrderCheck>")
 
-  assert(qParser.consumeSpace("pi") == ("", "pi"))
-  assert(qParser.consumeSpace(" pi") == (" ", "pi"))
-  assert(qParser.consumeSpace("   pi") == ("   ", "pi"))
+  for (inputStr, expected) in [
+    ("pi",     ("", "pi")),
+    (" pi",    (" ", "pi")),
+    ("   pi",  ("   ", "pi")),
+    ("   ",    ("   ", "")),
+  ] :
+    assert(qParser.consumeSpace(inputStr) == expected), inputStr
   print("- Passed: <consumeSpace>")
 
-  assert(qParser.consumeConst("pi") == ("pi", ""))
-  assert(qParser.consumeConst("inf") == ("inf", ""))
-  assert(qParser.consumeConst("eps*4") == ("eps", "*4"))
-  assert(qParser.consumeConst("pi3") == ("pi", "3"))
-  assert(qParser.consumeConst("pi_3") == ("", "pi_3"))
-  assert(qParser.consumeConst("pir") == ("", "pir"))
-  assert(qParser.consumeConst("api") == ("", "api"))
-  assert(qParser.consumeConst("pi*12") == ("pi", "*12"))
-  assert(qParser.consumeConst("pi 12") == ("pi", " 12"))
-  assert(qParser.consumeConst("pi(12+3") == ("pi", "(12+3"))
-  assert(qParser.consumeConst("pir*12") == ("", "pir*12"))
-  assert(qParser.consumeConst("pi*r*12") == ("pi", "*r*12"))
-  assert(qParser.consumeConst("i*pi*r*12") == ("i", "*pi*r*12"))
+  for (inputStr, expected) in [
+    ("pi",         ("pi", "")),
+    ("inf",        ("inf", "")),
+    ("eps*4",      ("eps", "*4")),
+    ("pi3",        ("pi", "3")),
+    ("pi_3",       ("", "pi_3")),
+    ("pir",        ("", "pir")),
+    ("api",        ("", "api")),
+    ("pi*12",      ("pi", "*12")),
+    ("pi 12",      ("pi", " 12")),
+    ("pi(12+3",    ("pi", "(12+3")),
+    ("pir*12",     ("", "pir*12")),
+    ("pi*r*12",    ("pi", "*r*12")),
+    ("i*pi*r*12",  ("i", "*pi*r*12")),
+    ("ipi",        ("", "ipi")),
+    ("inf_2",      ("", "inf_2")),
+  ] :
+    assert(qParser.consumeConst(inputStr) == expected), inputStr
   print("- Passed: <consumeConst>")
 
-  assert(qParser.consumeNumber("42") == ("42", ""))
-  assert(qParser.consumeNumber("4.2") == ("4.2", ""))
-  assert(qParser.consumeNumber("4.2.") == ("4.2", "."))
-  assert(qParser.consumeNumber(".") == ("", "."))
-  assert(qParser.consumeNumber("-.") == ("", "-."))
-  assert(qParser.consumeNumber("-12a") == ("", "-12a"))
-  assert(qParser.consumeNumber("-33.1") == ("", "-33.1"))
-  assert(qParser.consumeNumber("3.14cos(x)") == ("3.14", "cos(x)"))
-  assert(qParser.consumeNumber("6.280 sin(y") == ("6.280", " sin(y"))
-  assert(qParser.consumeNumber(" 64") == ("", " 64"))
-  assert(qParser.consumeNumber("x86") == ("", "x86"))
+  for (inputStr, expected) in [
+    ("42",           ("42", "")),
+    ("4.2",          ("4.2", "")),
+    ("4.2.",         ("4.2", ".")),
+    (".",            ("", ".")),
+    ("-.",           ("", "-.")),
+    ("-12a",         ("", "-12a")),
+    ("-33.1",        ("", "-33.1")),
+    ("3.14cos(x)",   ("3.14", "cos(x)")),
+    ("6.280 sin(y",  ("6.280", " sin(y")),
+    (" 64",          ("", " 64")),
+    ("x86",          ("", "x86")),
+    (".5x",          (".5", "x")),
+    ("12.",          ("12.", "")),
+  ] :
+    assert(qParser.consumeNumber(inputStr) == expected), inputStr
   print("- Passed: <consumeNumber>")
 
-  assert(qParser.consumeFunc("sina") == ("", "sina"))
-  assert(qParser.consumeFunc("sinc(3x+12)") == ("sinc", "3x+12)"))
-  assert(qParser.consumeFunc("tan (x-pi)") == ("", "tan (x-pi)"))
-  assert(qParser.consumeFunc("floot(-2.4)") == ("", "floot(-2.4)"))
-  assert(qParser.consumeFunc("floor(-2.4)") == ("floor", "-2.4)"))
-  assert(qParser.consumeFunc("q(2.4, 0.1)") == ("", "q(2.4, 0.1)"))
-  assert(qParser.consumeFunc("Q(2.4, 0.1)") == ("Q", "2.4, 0.1)"))
+  for (inputStr, expected) in [
+    ("sina",         ("", "sina")),
+    ("sinc(3x+12)",  ("sinc", "3x+12)")),
+    ("tan (x-pi)",   ("", "tan (x-pi)")),
+    ("floot(-2.4)",  ("", "floot(-2.4)")),
+    ("floor(-2.4)",  ("floor", "-2.4)")),
+    ("q(2.4, 0.1)",  ("", "q(2.4, 0.1)")),
+    ("Q(2.4, 0.1)",  ("Q", "2.4, 0.1)")),
+  ] :
+    assert(qParser.consumeFunc(inputStr) == expected), inputStr
   print("- Passed: <consumeFunc>")
 
-  assert(qParser.consumeVar("bonjour") == ("bonjour", ""))
-  assert(qParser.consumeVar("3x") == ("", "3x"))
-  assert(qParser.consumeVar("x_2*3") == ("x_2", "*3"))
-  assert(qParser.consumeVar("x_23//4") == ("x_23", "//4"))
-  assert(qParser.consumeVar("x2.3") == ("x", "2.3"))            # Raises a warning
-  assert(qParser.consumeVar("x_23.0+ 1") == ("x_", "23.0+ 1"))  # Raises a warning (this input is seriously odd)
-  assert(qParser.consumeVar(".1") == ("", ".1"))
-  assert(qParser.consumeVar("pi*12x") == ("", "pi*12x"))
-  assert(qParser.consumeVar("sin(2pi*x)") == ("", "sin(2pi*x)"))
-  assert(qParser.consumeVar("_a") == ("_a", ""))
+  for (inputStr, expected) in [
+    ("bonjour",     ("bonjour", "")),
+    ("3x",          ("", "3x")),
+    ("x_2*3",       ("x_2", "*3")),
+    ("x_23//4",     ("x_23", "//4")),
+    ("x2.3",        ("x", "2.3")),            # Raises a warning
+    ("x_23.0+ 1",   ("x_", "23.0+ 1")),  # Raises a warning (this input is seriously odd)
+    (".1",          ("", ".1")),
+    ("pi*12x",      ("", "pi*12x")),
+    ("sin(2pi*x)",  ("", "sin(2pi*x)")),
+    ("_a",          ("_a", "")),
+    ("x2y3+1",      ("x2y3", "+1")),
+    ("R1é",         ("R1", "é")),
+  ] :
+    assert(qParser.consumeVar(inputStr) == expected), inputStr
   print("- Passed: <consumeVar>")
 
-  assert(qParser.consumeInfix("*3x") == ("*", "3x"))
-  assert(qParser.consumeInfix("**2+1") == ("*", "*2+1"))
-  assert(qParser.consumeInfix("//2+1") == ("//", "2+1"))
-  assert(qParser.consumeInfix("x-y") == ("", "x-y"))
-  assert(qParser.consumeInfix("-2x+y") == ("-", "2x+y"))
-  assert(qParser.consumeInfix("^-3") == ("^", "-3"))
+  qParserVars = QParser()
+  qParserVars.addVariable("x")
+  qParserVars.addVariable("y_1")
+  qParserVars.addVariable("x")
+  assert(qParserVars.variables == ["x", "y_1"])
+  qParserVars.variables.clear()
+  qParserVars.addVariable("x")
+  assert(qParserVars.variables == ["x"])
+  qParserVars.variables.append("z")
+  qParserVars.addVariable("z")
+  assert(qParserVars.variables == ["x", "z"])
+  qParserVars.variables = ["a", "b"]
+  qParserVars.addVariable("x")
+  assert(qParserVars.variables == ["a", "b", "x"])
+  print("- Passed: <addVariable>")
+
+  for (inputStr, expected) in [
+    ("*3x",    ("*", "3x")),
+    ("**2+1",  ("*", "*2+1")),
+    ("//2+1",  ("//", "2+1")),
+    ("x-y",    ("", "x-y")),
+    ("-2x+y",  ("-", "2x+y")),
+    ("^-3",    ("^", "-3")),
+  ] :
+    assert(qParser.consumeInfix(inputStr) == expected), inputStr
   print("- Passed: <consumeInfix>")
+
+  assert([t.name for t in qParser.expandMult(qParser.tokenize("2pi"))] == ["2", "*", "pi"])
+  assert([t.name for t in qParser.expandMult(qParser.tokenize("(x+1)pi"))] == ["(", "x", "+", "1", ")", "*", "pi"])
+  assert([t.name for t in qParser.expandMult(qParser.tokenize("2x(y)"))] == ["2", "*", "x", "*", "(", "y", ")"])
+  assert([t.name for t in qParser.expandMult(qParser.tokenize("x"))] == ["x"])
+  assert([t.name for t in qParser.expandMult(qParser.tokenize("x+1"))] == ["x", "+", "1"])
+  print("- Passed: <expandMult>")
+
+  assert([t.name for t in qParser.tokenize(".5x+ 1")] == [".5", "x", "+", "1"])
+  assert([t.name for t in qParser.tokenize("sin(x)")] == ["sin", "(", "x", ")"])
+  assert([t.name for t in qParser.tokenize("2x$")] == ["2", "x"])
+  assert(scanToken("  cos(x)", 0) == ("FUNCTION", 2, 5))
+  assert(scanToken("2.5x", 0) == ("NUMBER", 0, 3))
+  assert(scanToken("x)", 1) == ("BRKT_CLOSE", 1, 2))
+  assert(scanToken("x   ", 1) == ("END", 4, 4))
+  assert(qParser.tokenize("2x+y")[0] is qParser.tokenize("2x+y")[0])
+  assert(qParser.variables[-2:] == ["x", "y"])
+  for _ in range(2) :
+    with contextlib.redirect_stdout(io.StringIO()) as log :
+      QParser().tokenize("x2.3+y$")
+    assert("[WARNING]" in log.getvalue()) and ("[ERROR] unexpected character." in log.getvalue())
+  qParserR3 = QParser()
+  with contextlib.redirect_stdout(io.StringIO()) as log :
+    assert([t.name for t in qParserR3.tokenize("cos (3x)")] == ["(", "3", "x", ")"])
+    assert([t.name for t in qParserR3.tokenize("sin x")] == ["x"])
+  assert(qParserR3.variables == ["x"])
+  assert("(rule [R3])" in log.getvalue())
+  assert(scanToken("cos (3x)", 0) == ("RESERVED", 0, 3))
+  assert(tokenizeCached("x2.3+y$")[2][1:] == ("x2.3+y$\n      ^", "[ERROR] unexpected character."))
+  print("- Passed: <tokenize>")
   print()
 
   expr = [
     "2x*cos(3.1415t-1.)", 
     "-2x*cos(pi*t-1//R2)", 
-    "-R3_2.0x*cos(3.1415t-1//R2)"
+    "-R3_2.0x*cos(3.1415t-1//R2)",
+    "x + 1 "
   ]
 
   for e in expr :
@@ -1300,4 +1708,14 @@ if (__name__ == '__main__') :
     print(out)
     print(qParser.expandMult(out))
     print()
+
+  # Steady-state timing of the tokenizer (the expression cache is bypassed)
+  nRuns = 1000
+  for e in expr :
+    tStart = time.perf_counter()
+    for _ in range(nRuns) :
+      tokenizeCached.__wrapped__(e)
+    tElapsed = time.perf_counter() - tStart
+    
+    print(f"- timing: '{e}': {1e6*tElapsed/nRuns:.2f} us/call")
   